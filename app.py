@@ -1,162 +1,416 @@
 # app.py
 import streamlit as st
 import pandas as pd
+import os
 import sqlite3
+import threading
+import time
 from datetime import datetime
 from io import BytesIO
 
+try:
+    # optional: columnar engine for the analytics panel; falls back to SQLite when missing
+    import duckdb
+except ImportError:
+    duckdb = None
+
+from db_schema import DATABASE_FILE, TABLE_NAME, CREATE_TABLE_SQL, create_or_migrate_table
+
 # -----------------------
 # Config & Constants
 # -----------------------
-DATABASE_FILE = "securecheck_police_logs.db"
-TABLE_NAME = "police_stop_logs"
+# single-row running totals and the set of seen vehicles, both maintained by an AFTER INSERT trigger
+STATS_TABLE = "stats_kpi"
+STATS_VEHICLES_TABLE = "stats_vehicles"
+# pre-aggregated sources for the Quick Visuals, maintained by the same kind of trigger
+SUMMARY_HOUR_TABLE = "summary_hour"
+SUMMARY_DRUG_VEHICLES_TABLE = "summary_drug_vehicles"
+# Parquet snapshot of the log table read by DuckDB for the analytics panel; a snapshot that is
+# behind the table is still served until it is this old, so rebuilds run at most once per window
+ANALYTICS_PARQUET = "police_stop_logs.parquet"
+ANALYTICS_SNAPSHOT_MAX_AGE = 60  # seconds
+
+# Everything that hangs off the log table; idempotent, so it is safe to re-run on every start.
+SCHEMA_OBJECTS_SQL = f"""
+    -- indexes on the hot predicates (vehicle lookup / real-time flag, GROUP BY country & violation)
+    CREATE INDEX IF NOT EXISTS idx_vehicle_arrest ON {TABLE_NAME}(vehicle_number, is_arrested);
+    CREATE INDEX IF NOT EXISTS idx_country_violation ON {TABLE_NAME}(country_name, violation);
+    CREATE INDEX IF NOT EXISTS idx_stop_dt ON {TABLE_NAME}(stop_datetime);
+    CREATE INDEX IF NOT EXISTS idx_hour ON {TABLE_NAME}(stop_hour);
+    CREATE INDEX IF NOT EXISTS idx_age_group ON {TABLE_NAME}(age_group);
+    -- partial indexes: only the flagged rows are indexed
+    CREATE INDEX IF NOT EXISTS idx_drug ON {TABLE_NAME}(vehicle_number) WHERE drugs_related_stop = 1;
+    CREATE INDEX IF NOT EXISTS idx_search ON {TABLE_NAME}(vehicle_number) WHERE search_conducted = 1;
+
+    -- KPI totals kept up to date on insert, so the KPI row never scans the log table
+    CREATE TABLE IF NOT EXISTS {STATS_TABLE} (
+        total_stops INTEGER NOT NULL,
+        total_arrests INTEGER NOT NULL,
+        total_drug_stops INTEGER NOT NULL,
+        unique_vehicles INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS {STATS_VEHICLES_TABLE} (vehicle_number TEXT PRIMARY KEY);
+    -- seed once from whatever rows are already in the log table
+    INSERT OR IGNORE INTO {STATS_VEHICLES_TABLE} (vehicle_number)
+    SELECT DISTINCT vehicle_number FROM {TABLE_NAME}
+    WHERE vehicle_number IS NOT NULL AND NOT EXISTS (SELECT 1 FROM {STATS_TABLE});
+    INSERT INTO {STATS_TABLE}
+    SELECT COUNT(*),
+           COALESCE(SUM((flags >> 1) & 1), 0),
+           COALESCE(SUM((flags >> 2) & 1), 0),
+           (SELECT COUNT(*) FROM {STATS_VEHICLES_TABLE})
+    FROM {TABLE_NAME}
+    HAVING NOT EXISTS (SELECT 1 FROM {STATS_TABLE});  -- HAVING: an aggregate without GROUP BY always yields a row
+    -- keep the first row only (earlier versions could append an all-zero row per session)
+    DELETE FROM {STATS_TABLE} WHERE rowid <> (SELECT MIN(rowid) FROM {STATS_TABLE});
+    -- changes() is 1 only when the vehicle was not seen before
+    CREATE TRIGGER IF NOT EXISTS trg_stats_kpi_insert AFTER INSERT ON {TABLE_NAME}
+    BEGIN
+        INSERT OR IGNORE INTO {STATS_VEHICLES_TABLE} (vehicle_number)
+        SELECT NEW.vehicle_number WHERE NEW.vehicle_number IS NOT NULL;
+        UPDATE {STATS_TABLE}
+        SET total_stops = total_stops + 1,
+            total_arrests = total_arrests + ((NEW.flags >> 1) & 1),
+            total_drug_stops = total_drug_stops + ((NEW.flags >> 2) & 1),
+            unique_vehicles = unique_vehicles + changes();
+    END;
+
+    -- Quick Visuals: stops per hour and drug-related stops per vehicle, upserted on insert
+    CREATE TABLE IF NOT EXISTS {SUMMARY_HOUR_TABLE} (
+        hour INTEGER PRIMARY KEY,
+        stops INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS {SUMMARY_DRUG_VEHICLES_TABLE} (
+        vehicle_number TEXT PRIMARY KEY,
+        drug_stop_count INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_summary_drug_count ON {SUMMARY_DRUG_VEHICLES_TABLE}(drug_stop_count);
+    -- seed from the log table while empty (an empty summary is only consistent with no matching rows)
+    INSERT INTO {SUMMARY_HOUR_TABLE} (hour, stops)
+    SELECT stop_hour, COUNT(*) FROM {TABLE_NAME}
+    WHERE stop_hour IS NOT NULL AND NOT EXISTS (SELECT 1 FROM {SUMMARY_HOUR_TABLE})
+    GROUP BY stop_hour;
+    INSERT INTO {SUMMARY_DRUG_VEHICLES_TABLE} (vehicle_number, drug_stop_count)
+    SELECT vehicle_number, COUNT(*) FROM {TABLE_NAME}
+    WHERE drugs_related_stop = 1 AND vehicle_number IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM {SUMMARY_DRUG_VEHICLES_TABLE})
+    GROUP BY vehicle_number;
+    CREATE TRIGGER IF NOT EXISTS trg_summary_insert AFTER INSERT ON {TABLE_NAME}
+    BEGIN
+        INSERT INTO {SUMMARY_HOUR_TABLE} (hour, stops)
+        SELECT NEW.stop_hour, 1 WHERE NEW.stop_hour IS NOT NULL
+        ON CONFLICT(hour) DO UPDATE SET stops = stops + 1;
+        INSERT INTO {SUMMARY_DRUG_VEHICLES_TABLE} (vehicle_number, drug_stop_count)
+        SELECT NEW.vehicle_number, 1 WHERE NEW.drugs_related_stop = 1 AND NEW.vehicle_number IS NOT NULL
+        ON CONFLICT(vehicle_number) DO UPDATE SET drug_stop_count = drug_stop_count + 1;
+    END;
+"""
+
+# Hot write-path statements, built once: passing the same string object on every call lets
+# sqlite3's per-connection statement cache hand back the already-prepared statement.
+FLAG_SQL = f"SELECT COUNT(*) FROM {TABLE_NAME} WHERE vehicle_number = ? AND is_arrested = 1;"
+INSERT_SQL = f"""
+    INSERT INTO {TABLE_NAME}
+    (stop_datetime, country_name, vehicle_number,
+     driver_gender, driver_age, driver_race, violation,
+     stop_duration, stop_outcome, search_conducted,
+     search_type, is_arrested, drugs_related_stop,
+     stop_year, stop_month, stop_hour)
+    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?);
+"""
 
 st.set_page_config(layout="wide", page_title="SecureCheck Digital Ledger")
 
 # -----------------------
 # Database helpers
 # -----------------------
+@st.cache_resource
 def get_db_connection():
-    """Return a new sqlite3 connection (no caching)."""
-    conn = sqlite3.connect(DATABASE_FILE, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+    """Return the process-wide sqlite3 connection (opened once, shared by sessions and reruns)."""
+    # room for every distinct report/lookup statement, so none evicts the write-path ones
+    conn = sqlite3.connect(DATABASE_FILE, check_same_thread=False, cached_statements=256,
+                           detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA mmap_size=268435456;")
+    conn.execute("PRAGMA cache_size=-65536;")
     return conn
 
+@st.cache_resource
+def get_db_lock():
+    """Return the lock guarding writes on the shared connection."""
+    return threading.Lock()
+
+@st.cache_resource
+def get_write_cursor():
+    """Return the long-lived cursor used by insert_log (only touched while holding get_db_lock())."""
+    return get_db_connection().cursor()
+
+def run_schema_script(script):
+    """Run a multi-statement DDL script on the shared connection as one transaction."""
+    conn = get_db_connection()
+    with get_db_lock():
+        try:
+            conn.executescript(f"BEGIN; {script} COMMIT;")
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
 def init_db():
-    """Create table if not exists with a proper primary key (stop_id)."""
+    """Create table (with a proper primary key, stop_id) and its indexes if they do not exist."""
     conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(f"""
-        CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
-            stop_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            stop_datetime TEXT,
-            country_name TEXT,
-            vehicle_number TEXT,
-            driver_gender TEXT,
-            driver_age INTEGER,
-            driver_race TEXT,
-            violation TEXT,
-            stop_duration TEXT,
-            stop_outcome TEXT,
-            search_conducted INTEGER,
-            search_type TEXT,
-            is_arrested INTEGER,
-            drugs_related_stop INTEGER
-        );
-    """)
-    conn.commit()
-    conn.close()
+    with get_db_lock(), conn:
+        # explicit: legacy-mode sqlite3 would leave the DDL of a migration in autocommit
+        conn.execute("BEGIN IMMEDIATE;")
+        create_or_migrate_table(conn)
+    run_schema_script(SCHEMA_OBJECTS_SQL)
+    # planner statistics (sqlite_stat1) so the indexes are actually picked; a full ANALYZE scans every
+    # index, so only tables with an index that has no statistics yet (new, rebuilt or seeded) are analyzed
+    tables = tables_missing_stats()
+    if tables:
+        run_schema_script(" ".join(f"ANALYZE {table};" for table in tables))
+
+def tables_missing_stats():
+    """Return the tables owning an index that has no sqlite_stat1 row (empty tables never get one)."""
+    conn = get_db_connection()
+    has_stats = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1';").fetchone()
+    return [row[0] for row in conn.execute(f"""
+        SELECT DISTINCT m.tbl_name FROM sqlite_master m
+        WHERE m.type = 'index' AND m.sql IS NOT NULL
+        {"AND NOT EXISTS (SELECT 1 FROM sqlite_stat1 s WHERE s.idx = m.name)" if has_stats else ""};
+    """)]
 
 def run_query(sql, params=None):
-    conn = get_db_connection()
+    # plain cursor execute: the same SQL string hits sqlite3's prepared-statement cache
+    cur = get_db_connection().cursor()
+    cur.row_factory = None
+    cur.execute(sql, params or ())
+    columns = [col[0] for col in cur.description]
+    return pd.DataFrame.from_records(cur.fetchall(), columns=columns)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_query(sql: str, params: tuple = ()) -> pd.DataFrame:
+    """Memoized run_query for read-only queries; cleared whenever the table changes."""
+    return run_query(sql, list(params) or None)
+
+@st.cache_resource
+def get_snapshot_state():
+    """Return the snapshot bookkeeping shared by all sessions.
+
+    "lock" is held for the whole rebuild; "stops" and "taken_at" are the row count
+    and time the current snapshot was read at, compared with the live total and the
+    clock to decide whether it may still be served.
+    """
+    return {"lock": threading.Lock(), "stops": None, "taken_at": 0.0}
+
+def refresh_analytics_snapshot(state):
+    """Rewrite the zstd Parquet snapshot of the log table that analytics queries scan.
+
+    The caller holds state["lock"]. Uses its own sqlite3 connection and no Streamlit
+    calls, so it can run on a background thread.
+    """
+    taken_at = time.time()
+    conn = sqlite3.connect(DATABASE_FILE)
     try:
-        if params:
-            df = pd.read_sql_query(sql, conn, params=params)
-        else:
-            df = pd.read_sql_query(sql, conn)
+        cur = conn.execute(f"SELECT * FROM {TABLE_NAME};")
+        df = pd.DataFrame.from_records(cur.fetchall(), columns=[col[0] for col in cur.description])
     finally:
         conn.close()
+    tmp_path = f"{ANALYTICS_PARQUET}.tmp"
+    duck = duckdb.connect(":memory:")
+    try:
+        duck.register("snapshot", df)
+        duck.execute(f"COPY snapshot TO '{tmp_path}' (FORMAT PARQUET, CODEC 'zstd');")
+    finally:
+        duck.close()
+    # atomic swap: concurrent readers see either the old or the new file
+    os.replace(tmp_path, ANALYTICS_PARQUET)
+    state["stops"], state["taken_at"] = len(df), taken_at
+
+def _refresh_in_background(state):
+    try:
+        refresh_analytics_snapshot(state)
+    finally:
+        state["lock"].release()
+
+def start_snapshot_refresh():
+    """Rebuild the snapshot on a background thread, off the request path (no-op if one is running)."""
+    state = get_snapshot_state()
+    # the lock is released by the worker thread once the new file is in place
+    if state["lock"].acquire(blocking=False):
+        threading.Thread(target=_refresh_in_background, args=(state,), daemon=True).start()
+
+def snapshot_is_usable():
+    """True when the snapshot holds every row, or is behind but younger than ANALYTICS_SNAPSHOT_MAX_AGE."""
+    state = get_snapshot_state()
+    if state["stops"] is None or not os.path.exists(ANALYTICS_PARQUET):
+        return False
+    return (state["stops"] == load_kpis()["total_stops"]
+            or time.time() - state["taken_at"] < ANALYTICS_SNAPSHOT_MAX_AGE)
+
+def invalidate_analytics_snapshot():
+    state = get_snapshot_state()
+    # waits for a running rebuild, so it cannot put pre-invalidation rows back afterwards
+    with state["lock"]:
+        if os.path.exists(ANALYTICS_PARQUET):
+            os.remove(ANALYTICS_PARQUET)
+        state["stops"] = None
+
+@st.cache_resource
+def get_analytics_connection():
+    """Return an in-memory DuckDB connection exposing the snapshot under the SQLite table name."""
+    duck = duckdb.connect(":memory:")
+    duck.execute(f"CREATE VIEW {TABLE_NAME} AS SELECT * FROM read_parquet('{ANALYTICS_PARQUET}');")
+    return duck
+
+def analytics_query(sql: str, params: tuple = ()) -> pd.DataFrame:
+    """Run a read-only report on DuckDB over the Parquet snapshot.
+
+    Falls back to SQLite when DuckDB is unavailable, the table is empty, or the
+    snapshot is missing or both behind and older than ANALYTICS_SNAPSHOT_MAX_AGE;
+    in the last cases a rebuild is started in the background. Reports therefore
+    never wait for a rebuild, rebuild at most once per window under a steady stream
+    of inserts, and may omit only stops logged within the last window.
+    """
+    if duckdb is None or load_kpis()["total_stops"] == 0:
+        return cached_query(sql, params)
+    if not snapshot_is_usable():
+        start_snapshot_refresh()
+        return cached_query(sql, params)
+    return snapshot_query(sql, params, get_snapshot_state()["taken_at"])
+
+@st.cache_data(ttl=60, show_spinner=False)
+def snapshot_query(sql: str, params: tuple, snapshot_taken_at: float) -> pd.DataFrame:
+    """Run sql on DuckDB over the Parquet snapshot; snapshot_taken_at only keys the cache to that snapshot."""
+    # one cursor per call: DuckDB connections must not be shared across threads
+    cur = get_analytics_connection().cursor()
+    try:
+        result = cur.execute(sql, list(params))
+        hugeint_cols = [col[0] for col in result.description if str(col[1]) == "HUGEINT"]
+        df = result.df()
+    finally:
+        cur.close()
+    # DuckDB widens integer SUM()s to HUGEINT, which pandas would turn into floats
+    for col in hugeint_cols:
+        df[col] = df[col].astype("Int64")
     return df
 
+def run_scalar(sql, params=None):
+    """Run a query and return its first row only (no DataFrame round-trip)."""
+    cur = get_db_connection().cursor()
+    cur.execute(sql, params or ())
+    return cur.fetchone()
+
 def insert_log(values_tuple):
+    """Insert a stop and return (stop_id, prior_arrests) for its vehicle.
+
+    The prior-arrest count is read in the same transaction as the insert, so the
+    alert always reflects the pre-insert state of the table. BEGIN IMMEDIATE takes
+    SQLite's write lock up front (legacy-mode sqlite3 would only BEGIN before the
+    INSERT), which also keeps other writers such as police.py out in between.
+    """
     conn = get_db_connection()
-    try:
-        insert_sql = f"""
-            INSERT INTO {TABLE_NAME}
-            (stop_datetime, country_name, vehicle_number,
-             driver_gender, driver_age, driver_race, violation,
-             stop_duration, stop_outcome, search_conducted,
-             search_type, is_arrested, drugs_related_stop)
-            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?);
-        """
-        cur = conn.cursor()
-        cur.execute(insert_sql, values_tuple)
-        conn.commit()
-        return cur.lastrowid
-    finally:
-        conn.close()
+    with get_db_lock(), conn:
+        cur = get_write_cursor()
+        cur.execute("BEGIN IMMEDIATE;")
+        cur.execute(FLAG_SQL, (values_tuple[2],))
+        (arrest_count,) = cur.fetchone()
+        cur.execute(INSERT_SQL, values_tuple)
+        rowid = cur.lastrowid
+    # every cached read (reports, KPIs) may now be stale; the analytics snapshot is now behind
+    # total_stops, so analytics_query() schedules its rebuild once it is past ANALYTICS_SNAPSHOT_MAX_AGE
+    st.cache_data.clear()
+    return rowid, arrest_count
+
+def to_csv_bytes(df):
+    """Encode df as UTF-8 CSV straight into a bytes buffer (no intermediate full-size str)."""
+    buf = BytesIO()
+    df.to_csv(buf, index=False, encoding='utf-8', chunksize=50000)
+    return buf.getvalue()
 
 def get_table_info():
-    conn = get_db_connection()
-    try:
-        cur = conn.cursor()
-        cur.execute(f"PRAGMA table_info({TABLE_NAME});")
-        return cur.fetchall()
-    finally:
-        conn.close()
+    cur = get_db_connection().cursor()
+    cur.execute(f"PRAGMA table_info({TABLE_NAME});")
+    return cur.fetchall()
 
 # -----------------------
 # SQL_QUERIES (Medium + Complex)
+# name -> (sql, country_sql): country_sql is the same report filtered to one country
+# (parameter ?), or None for reports without a country_name column.
+# Written in the SQL subset shared by SQLite and DuckDB (hence DOUBLE rather than REAL).
 # -----------------------
+COUNTRY_FILTER_SQL = "WHERE country_name = ?"
+
+def country_report(template):
+    """Return (unfiltered, filtered) SQL for a report with a {country_filter} slot before its GROUP BY.
+
+    Two fixed statements rather than a catch-all "? IS NULL OR ..." predicate: the filtered
+    one can seek idx_country_violation, and both stay in the prepared-statement cache.
+    """
+    return template.format(country_filter=""), template.format(country_filter=COUNTRY_FILTER_SQL)
+
 SQL_QUERIES = {
     # Vehicle-Based
-    "Top 10 vehicles in drug-related stops": """
+    "Top 10 vehicles in drug-related stops": ("""
         SELECT vehicle_number, COUNT(*) AS drug_stop_count
         FROM police_stop_logs
         WHERE drugs_related_stop = 1
         GROUP BY vehicle_number
         ORDER BY drug_stop_count DESC
         LIMIT 10;
-    """,
-    "Most frequently searched vehicles (Top 20)": """
+    """, None),
+    "Most frequently searched vehicles (Top 20)": ("""
         SELECT vehicle_number, COUNT(*) AS search_count
         FROM police_stop_logs
         WHERE search_conducted = 1
         GROUP BY vehicle_number
         ORDER BY search_count DESC
         LIMIT 20;
-    """,
+    """, None),
 
     # Demographic-Based
-    "Driver age group with highest arrest rate": """
-        WITH age_buckets AS (
-          SELECT
-            CASE
-              WHEN driver_age < 18 THEN '<18'
-              WHEN driver_age BETWEEN 18 AND 24 THEN '18-24'
-              WHEN driver_age BETWEEN 25 AND 34 THEN '25-34'
-              WHEN driver_age BETWEEN 35 AND 44 THEN '35-44'
-              WHEN driver_age BETWEEN 45 AND 54 THEN '45-54'
-              WHEN driver_age >= 55 THEN '55+'
-              ELSE 'Unknown'
-            END AS age_group,
-            is_arrested
-          FROM police_stop_logs
-        )
+    "Driver age group with highest arrest rate": ("""
         SELECT age_group,
                COUNT(*) AS total_stops,
-               SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS arrests,
-               CAST(SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS arrest_rate_pct
-        FROM age_buckets
+               SUM((flags >> 1) & 1) AS arrests,
+               CAST(SUM((flags >> 1) & 1) AS DOUBLE) * 100.0 / COUNT(*) AS arrest_rate_pct
+        FROM police_stop_logs
         GROUP BY age_group
         ORDER BY arrest_rate_pct DESC;
-    """,
-    "Gender distribution by country": """
+    """, None),
+    "Gender distribution by country": country_report("""
         SELECT country_name, driver_gender, COUNT(*) AS stops
         FROM police_stop_logs
+        {country_filter}
         GROUP BY country_name, driver_gender
         ORDER BY country_name, stops DESC;
-    """,
-    "Race+Gender combination with highest search rate": """
-        SELECT driver_race, driver_gender, COUNT(*) AS total_stops,
-               SUM(CASE WHEN search_conducted = 1 THEN 1 ELSE 0 END) AS searches,
-               CAST(SUM(CASE WHEN search_conducted = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS search_rate_pct
-        FROM police_stop_logs
-        GROUP BY driver_race, driver_gender
-        HAVING COUNT(*) >= 20
+    """),
+    "Race+Gender combination with highest search rate": ("""
+        WITH grouped AS MATERIALIZED (
+          SELECT driver_race, driver_gender, COUNT(*) AS total_stops, SUM(flags & 1) AS searches
+          FROM police_stop_logs
+          GROUP BY driver_race, driver_gender
+          HAVING COUNT(*) >= 20
+        )
+        SELECT driver_race, driver_gender, total_stops, searches,
+               CAST(searches AS DOUBLE) * 100.0 / total_stops AS search_rate_pct
+        FROM grouped
         ORDER BY search_rate_pct DESC
         LIMIT 10;
-    """,
+    """, None),
 
     # Time & Duration
-    "Stops by hour of day": """
-        SELECT CAST(strftime('%H', stop_datetime) AS INTEGER) AS hour_of_day, COUNT(*) AS stops
+    "Stops by hour of day": ("""
+        SELECT stop_hour AS hour_of_day, COUNT(*) AS stops
         FROM police_stop_logs
-        WHERE stop_datetime IS NOT NULL
+        WHERE stop_hour IS NOT NULL
         GROUP BY hour_of_day
         ORDER BY stops DESC;
-    """,
-    "Average stop duration for each violation (minutes)": """
+    """, None),
+    "Average stop duration for each violation (minutes)": ("""
         WITH mapped AS (
           SELECT violation,
                  CASE stop_duration
@@ -171,138 +425,139 @@ SQL_QUERIES = {
         FROM mapped
         GROUP BY violation
         ORDER BY avg_duration_minutes DESC;
-    """,
-    "Are night stops more likely to lead to arrests?": """
+    """, None),
+    "Are night stops more likely to lead to arrests?": ("""
         WITH flagged AS (
-          SELECT *, CAST(strftime('%H', stop_datetime) AS INTEGER) AS hour
+          SELECT *, stop_hour AS hour
           FROM police_stop_logs
         )
         SELECT CASE WHEN hour >= 20 OR hour <= 4 THEN 'night' ELSE 'day' END AS period,
                COUNT(*) AS total_stops,
-               SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS arrests,
-               CAST(SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS arrest_rate_pct
+               SUM((flags >> 1) & 1) AS arrests,
+               CAST(SUM((flags >> 1) & 1) AS DOUBLE) * 100.0 / COUNT(*) AS arrest_rate_pct
         FROM flagged
         GROUP BY period
         ORDER BY arrest_rate_pct DESC;
-    """,
+    """, None),
 
     # Violation-Based
-    "Violations most associated with searches or arrests": """
+    "Violations most associated with searches or arrests": ("""
         SELECT violation, COUNT(*) AS total_stops,
-               SUM(CASE WHEN search_conducted = 1 THEN 1 ELSE 0 END) AS searches,
-               SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS arrests,
-               CAST(SUM(CASE WHEN search_conducted = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS search_rate_pct,
-               CAST(SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS arrest_rate_pct
+               SUM(flags & 1) AS searches,
+               SUM((flags >> 1) & 1) AS arrests,
+               CAST(SUM(flags & 1) AS DOUBLE) * 100.0 / COUNT(*) AS search_rate_pct,
+               CAST(SUM((flags >> 1) & 1) AS DOUBLE) * 100.0 / COUNT(*) AS arrest_rate_pct
         FROM police_stop_logs
         GROUP BY violation
         HAVING COUNT(*) > 10
         ORDER BY arrest_rate_pct DESC, search_rate_pct DESC;
-    """,
-    "Violations common among drivers <25": """
+    """, None),
+    "Violations common among drivers <25": ("""
         SELECT violation,
                COUNT(*) AS stops_under25,
-               CAST(COUNT(*) AS REAL) / (SELECT COUNT(*) FROM police_stop_logs WHERE driver_age < 25) * 100.0 AS pct_of_under25_stops
+               CAST(COUNT(*) AS DOUBLE) / (SELECT COUNT(*) FROM police_stop_logs WHERE driver_age < 25) * 100.0 AS pct_of_under25_stops
         FROM police_stop_logs
         WHERE driver_age < 25
         GROUP BY violation
         ORDER BY stops_under25 DESC
         LIMIT 20;
-    """,
-    "Violations that rarely result in search or arrest": """
+    """, None),
+    "Violations that rarely result in search or arrest": ("""
         SELECT violation, COUNT(*) AS total_stops,
-               CAST(SUM(CASE WHEN search_conducted = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS search_rate_pct,
-               CAST(SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS arrest_rate_pct
+               CAST(SUM(flags & 1) AS DOUBLE) * 100.0 / COUNT(*) AS search_rate_pct,
+               CAST(SUM((flags >> 1) & 1) AS DOUBLE) * 100.0 / COUNT(*) AS arrest_rate_pct
         FROM police_stop_logs
         GROUP BY violation
         HAVING COUNT(*) > 50
         ORDER BY (search_rate_pct + arrest_rate_pct) ASC
         LIMIT 10;
-    """,
+    """, None),
 
     # Location-Based
-    "Countries with highest drug-related stop rate": """
+    "Countries with highest drug-related stop rate": country_report("""
         SELECT country_name, COUNT(*) AS total_stops,
-               SUM(CASE WHEN drugs_related_stop = 1 THEN 1 ELSE 0 END) AS drug_stops,
-               CAST(SUM(CASE WHEN drugs_related_stop = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS drug_rate_pct
+               SUM((flags >> 2) & 1) AS drug_stops,
+               CAST(SUM((flags >> 2) & 1) AS DOUBLE) * 100.0 / COUNT(*) AS drug_rate_pct
         FROM police_stop_logs
+        {country_filter}
         GROUP BY country_name
         HAVING COUNT(*) > 50
         ORDER BY drug_rate_pct DESC
         LIMIT 10;
-    """,
-    "Arrest rate by country and violation": """
-        SELECT country_name, violation, COUNT(*) AS total_stops,
-               SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS arrests,
-               CAST(SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS arrest_rate_pct
-        FROM police_stop_logs
-        GROUP BY country_name, violation
-        HAVING COUNT(*) >= 10
+    """),
+    "Arrest rate by country and violation": country_report("""
+        WITH grouped AS MATERIALIZED (
+          SELECT country_name, violation, COUNT(*) AS total_stops, SUM((flags >> 1) & 1) AS arrests
+          FROM police_stop_logs
+          {country_filter}
+          GROUP BY country_name, violation
+          HAVING COUNT(*) >= 10
+        )
+        SELECT country_name, violation, total_stops, arrests,
+               CAST(arrests AS DOUBLE) * 100.0 / total_stops AS arrest_rate_pct
+        FROM grouped
         ORDER BY arrest_rate_pct DESC
         LIMIT 50;
-    """,
-    "Country with most searches conducted": """
+    """),
+    "Country with most searches conducted": country_report("""
         SELECT country_name,
-               SUM(CASE WHEN search_conducted = 1 THEN 1 ELSE 0 END) AS searches,
+               SUM(flags & 1) AS searches,
                COUNT(*) AS total_stops,
-               CAST(SUM(CASE WHEN search_conducted = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS search_rate_pct
+               CAST(SUM(flags & 1) AS DOUBLE) * 100.0 / COUNT(*) AS search_rate_pct
         FROM police_stop_logs
+        {country_filter}
         GROUP BY country_name
         ORDER BY searches DESC
         LIMIT 10;
-    """,
+    """),
 
     # Complex Queries
-    "Yearly breakdown of stops and arrests by country": """
+    "Yearly breakdown of stops and arrests by country": country_report("""
         WITH parsed AS (
-          SELECT country_name, CAST(strftime('%Y', stop_datetime) AS INTEGER) AS year, is_arrested
+          SELECT country_name, stop_year AS year, flags
           FROM police_stop_logs
+          {country_filter}
         )
         SELECT country_name, year,
                COUNT(*) AS stops,
-               SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS arrests,
-               CAST(SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS arrest_rate_pct,
+               SUM((flags >> 1) & 1) AS arrests,
+               CAST(SUM((flags >> 1) & 1) AS DOUBLE) * 100.0 / COUNT(*) AS arrest_rate_pct,
                SUM(COUNT(*)) OVER (PARTITION BY country_name ORDER BY year ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS running_stops
         FROM parsed
         GROUP BY country_name, year
         ORDER BY country_name, year;
-    """,
-    "Driver violation trends by age & race": """
-        WITH age_grouped AS (
-          SELECT *,
-            CASE
-              WHEN driver_age < 18 THEN '<18'
-              WHEN driver_age BETWEEN 18 AND 24 THEN '18-24'
-              WHEN driver_age BETWEEN 25 AND 34 THEN '25-34'
-              WHEN driver_age BETWEEN 35 AND 44 THEN '35-44'
-              WHEN driver_age BETWEEN 45 AND 54 THEN '45-54'
-              WHEN driver_age >= 55 THEN '55+'
-              ELSE 'Unknown' END AS age_group
+    """),
+    "Driver violation trends by age & race": ("""
+        WITH base AS MATERIALIZED (
+          SELECT COUNT(*) AS n FROM police_stop_logs WHERE driver_age IS NOT NULL AND driver_age >= 0
+        ),
+        grouped AS MATERIALIZED (
+          SELECT age_group, driver_race, violation, COUNT(*) AS stops
           FROM police_stop_logs
+          GROUP BY age_group, driver_race, violation
         )
-        SELECT age_group, driver_race, violation,
-               COUNT(*) AS stops,
-               CAST(COUNT(*) AS REAL) * 100.0 / (SELECT COUNT(*) FROM police_stop_logs WHERE driver_age IS NOT NULL AND driver_age >= 0) AS pct_of_all_stops
-        FROM age_grouped
-        GROUP BY age_group, driver_race, violation
+        SELECT age_group, driver_race, violation, stops,
+               CAST(stops AS DOUBLE) * 100.0 / base.n AS pct_of_all_stops
+        FROM grouped, base
         ORDER BY age_group, stops DESC
         LIMIT 200;
-    """,
-    "Stops by year, month, hour": """
-        SELECT CAST(strftime('%Y', stop_datetime) AS INTEGER) AS year,
-               CAST(strftime('%m', stop_datetime) AS INTEGER) AS month,
-               CAST(strftime('%H', stop_datetime) AS INTEGER) AS hour,
+    """, None),
+    "Stops by year, month, hour": ("""
+        SELECT stop_year AS year,
+               stop_month AS month,
+               stop_hour AS hour,
                COUNT(*) AS stops
         FROM police_stop_logs
         GROUP BY year, month, hour
         ORDER BY year DESC, month DESC, hour;
-    """,
-    "Violations with high search & arrest rates (ranked)": """
-        WITH stats AS (
+    """, None),
+    "Violations with high search & arrest rates (ranked)": ("""
+        WITH stats AS MATERIALIZED (
           SELECT violation, COUNT(*) AS total,
-                 SUM(CASE WHEN search_conducted = 1 THEN 1 ELSE 0 END) AS searches,
-                 SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS arrests,
-                 CAST(SUM(CASE WHEN search_conducted = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS search_rate_pct,
-                 CAST(SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS arrest_rate_pct
+                 SUM(flags & 1) AS searches,
+                 SUM((flags >> 1) & 1) AS arrests,
+                 CAST(SUM(flags & 1) AS DOUBLE) * 100.0 / COUNT(*) AS search_rate_pct,
+                 CAST(SUM((flags >> 1) & 1) AS DOUBLE) * 100.0 / COUNT(*) AS arrest_rate_pct
           FROM police_stop_logs
           GROUP BY violation
           HAVING COUNT(*) > 30
@@ -312,35 +567,26 @@ SQL_QUERIES = {
         FROM stats
         ORDER BY rank_by_arrest_rate, rank_by_search_rate
         LIMIT 30;
-    """,
-    "Driver demographics by country": """
-        SELECT country_name, driver_gender,
-               CASE
-                 WHEN driver_age < 18 THEN '<18'
-                 WHEN driver_age BETWEEN 18 AND 24 THEN '18-24'
-                 WHEN driver_age BETWEEN 25 AND 34 THEN '25-34'
-                 WHEN driver_age BETWEEN 35 AND 44 THEN '35-44'
-                 WHEN driver_age BETWEEN 45 AND 54 THEN '45-54'
-                 WHEN driver_age >= 55 THEN '55+'
-                 ELSE 'Unknown'
-               END AS age_group,
-               driver_race,
+    """, None),
+    "Driver demographics by country": country_report("""
+        SELECT country_name, driver_gender, age_group, driver_race,
                COUNT(*) AS stops
         FROM police_stop_logs
+        {country_filter}
         GROUP BY country_name, driver_gender, age_group, driver_race
         ORDER BY country_name, stops DESC
         LIMIT 500;
-    """,
-    "Top 5 violations with highest arrest rates": """
+    """),
+    "Top 5 violations with highest arrest rates": ("""
         SELECT violation, COUNT(*) AS total_stops,
-               SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS arrests,
-               CAST(SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS REAL) * 100.0 / COUNT(*) AS arrest_rate_pct
+               SUM((flags >> 1) & 1) AS arrests,
+               CAST(SUM((flags >> 1) & 1) AS DOUBLE) * 100.0 / COUNT(*) AS arrest_rate_pct
         FROM police_stop_logs
         GROUP BY violation
         HAVING COUNT(*) >= 30
         ORDER BY arrest_rate_pct DESC
         LIMIT 5;
-    """,
+    """, None),
 }
 
 # -----------------------
@@ -363,9 +609,11 @@ with st.sidebar:
             st.experimental_rerun()
 
 # -----------------------
-# Initialize DB
+# Initialize DB (once per session)
 # -----------------------
-init_db()
+if not st.session_state.get("db_initialized"):
+    init_db()
+    st.session_state.db_initialized = True
 
 # -----------------------
 # Top-level header & quick KPIs
@@ -374,15 +622,11 @@ st.title("🚓 SecureCheck: Police Post Digital Ledger")
 st.markdown("Real-time logs, analytics, and automated alerts for check posts.")
 
 # KPI Row
+@st.cache_data(ttl=60, show_spinner=False)
 def load_kpis():
-    sql = f"""
-        SELECT
-          COUNT(*) AS total_stops,
-          SUM(CASE WHEN is_arrested = 1 THEN 1 ELSE 0 END) AS total_arrests,
-          SUM(CASE WHEN drugs_related_stop = 1 THEN 1 ELSE 0 END) AS total_drug_stops
-        FROM {TABLE_NAME};
-    """
-    return run_query(sql).iloc[0]
+    # O(1): totals are maintained by trg_stats_kpi_insert
+    sql = f"SELECT total_stops, total_arrests, total_drug_stops, unique_vehicles FROM {STATS_TABLE};"
+    return dict(run_scalar(sql))
 
 kpis = load_kpis()
 col1, col2, col3, col4 = st.columns(4)
@@ -390,7 +634,10 @@ col1.metric("Total Stops", int(kpis["total_stops"]))
 col2.metric("Total Arrests", int(kpis["total_arrests"]))
 drug_rate = (int(kpis["total_drug_stops"]) / int(kpis["total_stops"]) * 100.0) if kpis["total_stops"] > 0 else 0.0
 col3.metric("Drug-related %", f"{drug_rate:.1f}%")
-col4.metric("Unique Vehicles", run_query(f"SELECT COUNT(DISTINCT vehicle_number) AS uv FROM {TABLE_NAME};").iloc[0]["uv"])
+col4.metric("Unique Vehicles", kpis["unique_vehicles"])
+if duckdb is not None:
+    st.caption(f"KPIs and Quick Visuals are live; analytics reports may omit stops logged in the last "
+               f"{ANALYTICS_SNAPSHOT_MAX_AGE} seconds.")
 
 st.markdown("---")
 
@@ -428,15 +675,8 @@ with st.form("new_log_form"):
         if not vehicle_number or len(vehicle_number) < 4:
             st.error("Provide a valid vehicle number.")
         else:
-            stop_datetime = datetime.combine(stop_date, stop_time).strftime('%Y-%m-%d %H:%M:%S')
-            # real-time flagging
-            flag_query = f"SELECT COUNT(*) AS c FROM {TABLE_NAME} WHERE vehicle_number = ? AND is_arrested = 1;"
-            arrest_count = run_query(flag_query, params=[vehicle_number]).iloc[0]["c"]
-            if arrest_count > 0:
-                st.warning(f"🚨 AUTOMATED ALERT: Vehicle {vehicle_number} has {arrest_count} prior arrest records.")
-            else:
-                st.info(f"✅ Vehicle {vehicle_number} has no prior arrests (based on DB).")
-
+            stop_dt = datetime.combine(stop_date, stop_time)
+            stop_datetime = stop_dt.strftime('%Y-%m-%d %H:%M:%S')
             # ensure search_type consistency
             if search_conducted == 0:
                 search_type = "No Search"
@@ -444,11 +684,17 @@ with st.form("new_log_form"):
             new_log = (
                 stop_datetime, country_name, vehicle_number, driver_gender, int(driver_age),
                 driver_race, violation, stop_duration, stop_outcome, int(search_conducted),
-                search_type, int(is_arrested), int(drugs_related_stop)
+                search_type, int(is_arrested), int(drugs_related_stop),
+                stop_dt.year, stop_dt.month, stop_dt.hour
             )
 
             try:
-                rowid = insert_log(new_log)
+                # real-time flagging is answered inside the insert transaction
+                rowid, arrest_count = insert_log(new_log)
+                if arrest_count > 0:
+                    st.warning(f"🚨 AUTOMATED ALERT: Vehicle {vehicle_number} has {arrest_count} prior arrest records.")
+                else:
+                    st.info(f"✅ Vehicle {vehicle_number} has no prior arrests (based on DB).")
                 st.success(f"Log recorded successfully (stop_id={rowid}).")
                 # refresh KPIs (rudimentary)
                 kpis = load_kpis()
@@ -468,12 +714,12 @@ with st.expander("Search vehicle history"):
         if not vehicle_lookup:
             st.error("Enter a vehicle number.")
         else:
-            df_hist = run_query(f"SELECT * FROM {TABLE_NAME} WHERE vehicle_number = ? ORDER BY stop_datetime DESC LIMIT 200;", params=[vehicle_lookup])
+            df_hist = cached_query(f"SELECT * FROM {TABLE_NAME} WHERE vehicle_number = ? ORDER BY stop_datetime DESC LIMIT 200;", (vehicle_lookup,))
             if df_hist.empty:
                 st.info("No records found for this vehicle.")
             else:
                 st.dataframe(df_hist)
-                st.download_button("Export Vehicle History CSV", df_hist.to_csv(index=False).encode('utf-8'), file_name=f"{vehicle_lookup}_history.csv")
+                st.download_button("Export Vehicle History CSV", to_csv_bytes(df_hist), file_name=f"{vehicle_lookup}_history.csv")
 
 st.markdown("---")
 
@@ -482,28 +728,27 @@ st.markdown("---")
 # -----------------------
 st.header("📊 Advanced Insights & Crime Pattern Analysis")
 
+if duckdb is not None:
+    st.caption(f"Reports run on DuckDB over a Parquet snapshot of the log, rebuilt in the background at most "
+               f"once every {ANALYTICS_SNAPSHOT_MAX_AGE} seconds; stops logged since the last rebuild may be missing.")
+
 selected_query_name = st.selectbox("Select a Pre-defined Analytical Report to Run", list(SQL_QUERIES.keys()))
-query_to_run = SQL_QUERIES[selected_query_name]
+query_sql, country_sql = SQL_QUERIES[selected_query_name]
 
 # Allow user to supply optional parameter filters for some queries
 with st.expander("Optional Query Parameters"):
     country_filter = st.text_input("Country name filter (optional)", "")
     min_count = st.number_input("Minimum group size (for HAVING), 0 = use default", min_value=0, value=0)
 
-params = []
-# simple param logic for queries that accept a country or min_count -- not all queries use params
-if "country_name" in query_to_run and country_filter:
-    # naive replacement for demo: filter by country — append WHERE (if not exists) or AND
-    if "WHERE" in query_to_run.upper():
-        query_to_run = query_to_run.replace("WHERE", "WHERE country_name = ? AND ", 1)
-    else:
-        query_to_run = query_to_run.replace("GROUP BY", "WHERE country_name = ? GROUP BY", 1)
-    params.append(country_filter)
+# country reports filter inside their own WHERE, so top-N limits apply per country
+params = ()
+if country_sql and country_filter:
+    query_sql, params = country_sql, (country_filter,)
 
 # run the query
 if st.button("Run Analytical Query"):
     try:
-        df_results = run_query(query_to_run, params=params if params else None)
+        df_results = analytics_query(query_sql, params)
         if df_results.empty:
             st.info("Query ran successfully but returned no rows.")
         else:
@@ -518,7 +763,7 @@ if st.button("Run Analytical Query"):
                 st.write("Preview available — charting skipped due to column types.")
 
             # CSV export
-            csv_bytes = df_results.to_csv(index=False).encode('utf-8')
+            csv_bytes = to_csv_bytes(df_results)
             st.download_button("Export Query Results as CSV", csv_bytes, file_name=f"report_{selected_query_name.replace(' ', '_')}.csv")
     except Exception as e:
         st.error(f"Error running query: {e}. Ensure your DB structure is correct.")
@@ -535,7 +780,10 @@ col_a, col_b = st.columns(2)
 with col_a:
     st.subheader("Stops by Hour (Top hours)")
     try:
-        df_hours = run_query(SQL_QUERIES["Stops by hour of day"])
+        # same shape as the "Stops by hour of day" report, read from the trigger-maintained summary
+        df_hours = cached_query(
+            f"SELECT hour AS hour_of_day, stops FROM {SUMMARY_HOUR_TABLE} ORDER BY stops DESC;"
+        )
         if not df_hours.empty:
             st.bar_chart(df_hours.set_index("hour_of_day"))
         else:
@@ -546,7 +794,10 @@ with col_a:
 with col_b:
     st.subheader("Top Vehicles in Drug-related Stops")
     try:
-        df_topv = run_query(SQL_QUERIES["Top 10 vehicles in drug-related stops"])
+        df_topv = cached_query(
+            f"SELECT vehicle_number, drug_stop_count FROM {SUMMARY_DRUG_VEHICLES_TABLE} "
+            "ORDER BY drug_stop_count DESC LIMIT 10;"
+        )
         if not df_topv.empty:
             st.table(df_topv)
         else:
@@ -565,19 +816,35 @@ if st.session_state.get("role") == "Admin":
     info = get_table_info()
     st.table([dict(row) for row in info])
 
+    if duckdb is not None and st.button("Refresh analytics snapshot"):
+        try:
+            state = get_snapshot_state()
+            with state["lock"]:
+                refresh_analytics_snapshot(state)
+            st.cache_data.clear()
+            st.success("Analytics snapshot refreshed.")
+        except Exception as e:
+            st.error(f"Error refreshing snapshot: {e}")
+
     st.write("Danger zone (demo): Recreate DB (drops existing table). Use with caution.")
     if st.button("Recreate table (DROP & CREATE)"):
-        conn = get_db_connection()
-        cur = conn.cursor()
         try:
-            cur.execute(f"DROP TABLE IF EXISTS {TABLE_NAME};")
-            conn.commit()
-            init_db()
+            # drop + re-create schema, indexes, stats/summary tables and triggers atomically in a single transaction
+            run_schema_script(f"""
+                DROP TABLE IF EXISTS {TABLE_NAME};
+                DROP TABLE IF EXISTS {STATS_TABLE};
+                DROP TABLE IF EXISTS {STATS_VEHICLES_TABLE};
+                DROP TABLE IF EXISTS {SUMMARY_HOUR_TABLE};
+                DROP TABLE IF EXISTS {SUMMARY_DRUG_VEHICLES_TABLE};
+                {CREATE_TABLE_SQL}
+                {SCHEMA_OBJECTS_SQL}
+                ANALYZE;
+            """)
+            st.cache_data.clear()
+            invalidate_analytics_snapshot()
             st.success("Table recreated. Existing data was removed.")
         except Exception as e:
             st.error(f"Error recreating table: {e}")
-        finally:
-            conn.close()
 
 st.markdown("---")
 st.caption("SecureCheck — Prototype demo. For production: use PostgreSQL/MySQL, secure auth, TLS, and role-based permissions.")
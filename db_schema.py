@@ -0,0 +1,96 @@
+# db_schema.py
+# Log table schema shared by app.py (dashboard) and police.py (bulk loader)
+
+DATABASE_FILE = "securecheck_police_logs.db"
+TABLE_NAME = "police_stop_logs"
+
+# Columns derived at write time: stop_datetime parts (so analytics never call strftime() per row).
+# Maps column -> SQL used to backfill tables created before the column existed.
+DERIVED_COLUMNS = {
+    "stop_year": "CAST(strftime('%Y', stop_datetime) AS INTEGER)",
+    "stop_month": "CAST(strftime('%m', stop_datetime) AS INTEGER)",
+    "stop_hour": "CAST(strftime('%H', stop_datetime) AS INTEGER)",
+}
+
+# The three booleans packed into one bitmask (so aggregates read one column instead of three):
+# bit 0 = search_conducted, bit 1 = is_arrested, bit 2 = drugs_related_stop.
+# A generated column, so it can never disagree with the source columns.
+FLAGS_SQL = "COALESCE(search_conducted, 0) | (COALESCE(is_arrested, 0) << 1) | (COALESCE(drugs_related_stop, 0) << 2)"
+
+# Age bucket, materialized as a generated column instead of a CASE repeated in every report
+AGE_GROUP_SQL = """
+    CASE
+      WHEN driver_age < 18 THEN '<18'
+      WHEN driver_age BETWEEN 18 AND 24 THEN '18-24'
+      WHEN driver_age BETWEEN 25 AND 34 THEN '25-34'
+      WHEN driver_age BETWEEN 35 AND 44 THEN '35-44'
+      WHEN driver_age BETWEEN 45 AND 54 THEN '45-54'
+      WHEN driver_age >= 55 THEN '55+'
+      ELSE 'Unknown'
+    END
+"""
+
+CREATE_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+        stop_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        stop_datetime TEXT,
+        country_name TEXT,
+        vehicle_number TEXT,
+        driver_gender TEXT,
+        driver_age INTEGER,
+        driver_race TEXT,
+        violation TEXT,
+        stop_duration TEXT,
+        stop_outcome TEXT,
+        search_conducted INTEGER NOT NULL,
+        search_type TEXT,
+        is_arrested INTEGER NOT NULL,
+        drugs_related_stop INTEGER NOT NULL,
+        stop_year INTEGER,
+        stop_month INTEGER,
+        stop_hour INTEGER,
+        flags INTEGER GENERATED ALWAYS AS ({FLAGS_SQL}) STORED,
+        age_group TEXT GENERATED ALWAYS AS ({AGE_GROUP_SQL}) STORED
+    );
+"""
+
+def create_or_migrate_table(conn):
+    """Create the log table, or rebuild an older one into the current layout.
+
+    Tables created by pandas to_sql (the shipped database) or by earlier versions lack
+    stop_id or the derived columns, or hold flags/age_group as plain or VIRTUAL columns.
+    ALTER TABLE can add neither a primary key nor STORED columns, so such a table is
+    copied into a fresh one (old rowids become stop_ids) and its indexes and triggers
+    are recreated. Runs inside the caller's transaction; the caller commits.
+    """
+    conn.execute(CREATE_TABLE_SQL)
+    # table_xinfo (unlike table_info) also lists generated columns; hidden is 3 for STORED ones
+    existing = {row[1]: row[6] for row in conn.execute(f"PRAGMA table_xinfo({TABLE_NAME});")}
+    if ("stop_id" in existing and all(col in existing for col in DERIVED_COLUMNS)
+            and existing.get("flags") == 3 and existing.get("age_group") == 3):
+        return
+    dependents = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND tbl_name = ? AND sql IS NOT NULL;",
+        (TABLE_NAME,),
+    ).fetchall()
+    conn.execute(f"ALTER TABLE {TABLE_NAME} RENAME TO {TABLE_NAME}_old;")
+    conn.execute(CREATE_TABLE_SQL)
+    columns, sources = [], []
+    for _, col, _, notnull, _, _, hidden in conn.execute(f"PRAGMA table_xinfo({TABLE_NAME});").fetchall():
+        if hidden:
+            continue  # generated: computed by SQLite from the copied columns
+        columns.append(col)
+        if existing.get(col) == 0:
+            sources.append(f"COALESCE({col}, 0)" if notnull else col)
+        elif col == "stop_id":
+            sources.append("rowid")
+        else:
+            sources.append(DERIVED_COLUMNS.get(col, "NULL"))
+    conn.execute(
+        f"INSERT INTO {TABLE_NAME} ({', '.join(columns)}) "
+        f"SELECT {', '.join(sources)} FROM {TABLE_NAME}_old;"
+    )
+    # dropping the old table also drops its indexes and triggers, freeing their names
+    conn.execute(f"DROP TABLE {TABLE_NAME}_old;")
+    for (sql,) in dependents:
+        conn.execute(sql)
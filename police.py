@@ -1,48 +1,135 @@
-import pandas as pd
+import sqlite3
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv, parquet
+
+from db_schema import DATABASE_FILE, TABLE_NAME, create_or_migrate_table
 
 # 1. Load the dataset
 file_name = "traffic_stops - traffic_stops_with_vehicle_number.csv"
-df = pd.read_csv(file_name)
+# Arrow's multi-threaded C++ reader parses straight into typed columns:
+# 1-byte booleans, int16 ages and dictionary-encoded low-cardinality text columns
+bool_cols = ['search_conducted', 'is_arrested', 'drugs_related_stop']
+category = pa.dictionary(pa.int32(), pa.string())
+table = csv.read_csv(
+    file_name,
+    convert_options=csv.ConvertOptions(
+        column_types={
+            'stop_date': pa.string(),
+            'stop_time': pa.string(),
+            **{col: pa.bool_() for col in bool_cols},
+            'driver_age': pa.int16(),
+            'country_name': category,
+            'driver_gender': category,
+            'driver_race': category,
+            'violation': category,
+            'stop_duration': category,
+        },
+        # same missing-value markers pandas used (search_type is "None" when no search happened)
+        null_values=['', 'None', 'NA', 'N/A', 'NULL', 'NaN', 'nan', 'null'],
+        strings_can_be_null=True,
+    ),
+)
 # Print the initial shape as requested
-print("Initial Shape:", df.shape)
+print("Initial Shape:", (table.num_rows, table.num_columns))
 
 # --- Data Cleaning and Transformation ---
 
 # 2. Combine stop_date and stop_time into a single TIMESTAMP column
-df['stop_datetime'] = pd.to_datetime(df['stop_date'] + ' ' + df['stop_time'])
+# Parsed with a fixed format by Arrow's vectorized strptime (no per-row format inference)
+stop_datetime = pc.strptime(
+    pc.binary_join_element_wise(table['stop_date'], table['stop_time'], ' '),
+    format='%Y-%m-%d %H:%M:%S',
+    unit='s',
+)
 
 # 3. Drop redundant and separate date/time columns
 # Also drop the 'raw' columns as the 'cleaned' versions are available and complete
-df.drop(columns=['stop_date', 'stop_time', 'driver_age_raw', 'violation_raw'], inplace=True)
+table = table.drop_columns(['stop_date', 'stop_time', 'driver_age_raw', 'violation_raw'])
+table = table.append_column('stop_datetime', stop_datetime)
+
+# Normalize vehicle numbers exactly like the dashboard does for its inputs (.upper().strip()),
+# vectorized in Arrow's C++ string kernels rather than a per-row Python loop
+table = table.set_column(
+    table.schema.get_field_index('vehicle_number'),
+    'vehicle_number',
+    pc.utf8_trim_whitespace(pc.utf8_upper(table['vehicle_number'])),
+)
 
-# 4. Convert boolean columns (True/False) to integer (1/0) 
+# Pre-split the timestamp so SQL analytics can group on plain integers instead of strftime()
+table = table.append_column('stop_year', pc.year(stop_datetime).cast(pa.int16()))
+table = table.append_column('stop_month', pc.month(stop_datetime).cast(pa.int8()))
+table = table.append_column('stop_hour', pc.hour(stop_datetime).cast(pa.int8()))
+
+# 4. Convert boolean columns (True/False) to integer (1/0)
 # for consistent storage in SQL databases (PostgreSQL, MySQL, SQLite)
-bool_cols = ['search_conducted', 'is_arrested', 'drugs_related_stop']
 for col in bool_cols:
-    # Use .map to be explicit about True/False to 1/0 conversion if data type was object, 
-    # but since pandas already inferred bool, astype(int) is cleaner here.
-    df[col] = df[col].astype(int) 
+    table = table.set_column(table.schema.get_field_index(col), col, table[col].cast(pa.int8()))
 
 # 5. Reorder columns to logically match the planned SQL schema
 final_columns = [
     'stop_datetime', 'country_name', 'driver_gender', 'driver_age', 'driver_race',
     'violation', 'search_conducted', 'search_type', 'stop_outcome',
-    'is_arrested', 'stop_duration', 'drugs_related_stop', 'vehicle_number'
+    'is_arrested', 'stop_duration', 'drugs_related_stop', 'vehicle_number',
+    'stop_year', 'stop_month', 'stop_hour'
 ]
-df = df[final_columns]
+table = table.select(final_columns)
 
-# 6. Save the cleaned data to a new CSV file
-# This is the file you will use to load into your SQL database in Step 2.
-df.to_csv("cleaned_traffic_stops.csv", index=False)
+# 6. Save the cleaned data: typed, compressed Parquet plus the CSV used so far
+parquet.write_table(table, "cleaned_traffic_stops.parquet", compression='zstd')
+csv.write_csv(
+    table.cast(pa.schema([
+        pa.field(f.name, pa.string()) if pa.types.is_dictionary(f.type) else f for f in table.schema
+    ])),
+    "cleaned_traffic_stops.csv",
+)
 
-print("--- Data Processing Complete ---")
-print("Cleaned DataFrame Head:")
+# 7. Bulk-load the cleaned rows into the dashboard's SQLite database
+# Only into an empty table, so re-running the script never loads the same stops twice (the shipped
+# database already holds them). One explicit transaction covers the migration, the index drop/rebuild
+# and all batches: if anything fails, the table and its indexes are left exactly as they were.
+# stored as TEXT in the same 'YYYY-MM-DD HH:MM:SS' form app.py writes
+db_table = table.set_column(0, 'stop_datetime', pc.strftime(stop_datetime, format='%Y-%m-%d %H:%M:%S'))
+insert_sql = (
+    f"INSERT INTO {TABLE_NAME} ({', '.join(final_columns)}) "
+    f"VALUES ({', '.join('?' for _ in final_columns)});"
+)
+conn = sqlite3.connect(DATABASE_FILE, isolation_level=None)  # transactions are issued explicitly below
 try:
-    # to_markdown is optional; if not available, fallback to standard print
-    print(df.head().to_markdown(index=False, numalign="left", stralign="left"))
-except Exception:
-    print(df.head())
-
-print("\nCleaned DataFrame Info (Confirming data types):")
-# df.info() prints to stdout and returns None; no need to wrap in print()
-df.info()
\ No newline at end of file
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=OFF;")  # import only; app.py reopens with synchronous=NORMAL
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        # same DDL and migration as app.py's init_db(), so the shipped pandas-era table gains the derived columns
+        create_or_migrate_table(conn)
+        (existing_rows,) = conn.execute(f"SELECT COUNT(*) FROM {TABLE_NAME};").fetchone()
+        if existing_rows == 0:
+            indexes = conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL;",
+                (TABLE_NAME,),
+            ).fetchall()
+            for name, _ in indexes:
+                conn.execute(f"DROP INDEX IF EXISTS {name};")
+            for batch in db_table.to_batches(max_chunksize=10000):
+                conn.executemany(insert_sql, zip(*(column.to_pylist() for column in batch.columns)))
+            for _, sql in indexes:
+                conn.execute(sql)
+            conn.execute("ANALYZE;")
+        conn.execute("COMMIT;")
+    except Exception:
+        conn.execute("ROLLBACK;")
+        raise
+finally:
+    conn.close()
+if existing_rows == 0:
+    print(f"Loaded {table.num_rows} rows into {DATABASE_FILE}:{TABLE_NAME}")
+else:
+    print(f"{DATABASE_FILE}:{TABLE_NAME} already holds {existing_rows} rows; skipped the load "
+          "(delete the database file to reload from the CSV)")
+
+print("--- Data Processing Complete ---")
+print("Cleaned Table Head:")
+print(table.slice(0, 5).to_pylist())
+
+print("\nCleaned Table Schema (Confirming data types):")
+print(table.schema)